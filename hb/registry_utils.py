@@ -1,8 +1,10 @@
 import re
 
+_ALIAS_STRIP_RE = re.compile(r"[^a-z0-9]+")
+
 
 def normalize_alias(text):
-    return re.sub(r"[^a-z0-9]+", "", text.lower())
+    return _ALIAS_STRIP_RE.sub("", text.lower())
 
 
 def build_alias_index(metric_registry):
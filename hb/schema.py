@@ -4,6 +4,8 @@ import yaml
 
 from hb.registry_utils import normalize_alias
 
+_smap_msl_schema_cache = {}
+
 
 def load_schema(path):
     with open(path, "r") as f:
@@ -29,7 +31,13 @@ def load_nasa_http_tsv_schema():
 
 def load_smap_msl_telemetry_schema():
     path = os.environ.get("HB_SCHEMA_SMAP_MSL_TELEMETRY", _ingest_schema_path("smap_msl_telemetry"))
-    return load_schema(path)
+    mtime = os.path.getmtime(path)
+    cached = _smap_msl_schema_cache.get(path)
+    if cached and cached["mtime"] == mtime:
+        return cached["schema"]
+    schema = load_schema(path)
+    _smap_msl_schema_cache[path] = {"mtime": mtime, "schema": schema}
+    return schema
 
 
 def validate_pba_header(schema, header):
@@ -1,9 +1,12 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 from hb_core.adapters.base import ArtifactAdapter
 from hb_core.artifact import validate_artifact_dir
 
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class FilesystemAdapter(ArtifactAdapter):
     name = "filesystem"
@@ -12,12 +15,17 @@ class FilesystemAdapter(ArtifactAdapter):
         if not os.path.isdir(source_dir):
             raise ValueError(f"source_dir not found: {source_dir}")
         os.makedirs(out_dir, exist_ok=True)
-        for name in os.listdir(source_dir):
-            src = os.path.join(source_dir, name)
-            dst = os.path.join(out_dir, name)
-            if os.path.isdir(src):
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
+        with os.scandir(source_dir) as it:
+            entries = list(it)
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            list(executor.map(lambda entry: _copy_entry(entry, out_dir), entries))
         validate_artifact_dir(out_dir)
         return out_dir
+
+
+def _copy_entry(entry, out_dir):
+    dst = os.path.join(out_dir, entry.name)
+    if entry.is_dir():
+        shutil.copytree(entry.path, dst, dirs_exist_ok=True)
+    else:
+        shutil.copy2(entry.path, dst)
@@ -8,6 +8,37 @@ from collections import Counter
 from hb_core.adapters.base import ArtifactAdapter
 from hb_core.artifact import ARTIFACT_SCHEMA_VERSION, validate_artifact_dir
 
+# The timestamp styles are mutually exclusive at line start, so one anchored
+# match identifies the style.
+_TIMESTAMP_RE = re.compile(
+    r"(?P<iso>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})"
+    r"|(?P<hms>\d{2}:\d{2}:\d{2})"
+    r"|(?P<uptime>\[\d+(?:\.\d+)?\])"
+)
+_TIMESTAMP_STYLES = ("iso", "hms", "uptime")
+
+# Severity is ranked by label, not by position in the line, so a single scan
+# keeps the highest-ranked token seen.
+_SEVERITY_RE = re.compile(
+    r"(?P<ERROR>\bERROR\b|\bERR\b|\bE\b)"
+    r"|(?P<WARN>\bWARN(?:ING)?\b|\bWRN\b|\bW\b)"
+    r"|(?P<INFO>\bINFO\b|\bINF\b|\bI\b)"
+    r"|(?P<DEBUG>\bDEBUG\b|\bDBG\b|\bD\b)",
+    re.IGNORECASE,
+)
+_SEVERITY_RANK = {"ERROR": 0, "WARN": 1, "INFO": 2, "DEBUG": 3}
+
+# Hex runs are replaced first because doing so can open new word boundaries
+# for the integer and identifier tokens.
+_HEX_RE = re.compile(r"0x[0-9a-fA-F]+")
+_TOKEN_RE = re.compile(r"(?P<int>\b\d+\b)|(?P<id>\b[a-zA-Z]+[0-9]+\b)")
+_TOKEN_PLACEHOLDERS = {"int": "<int>", "id": "<id>"}
+
+_PREFIX_RE = re.compile(r"([A-Za-z0-9_/-]+):")
+_RESET_RE = re.compile(r"\bRESET\b", re.IGNORECASE)
+
+_READ_BLOCK_HINT = 1 << 20
+
 
 class VxWorksLogAdapter(ArtifactAdapter):
     name = "vxworks_logs"
@@ -63,33 +94,19 @@ class VxWorksLogAdapter(ArtifactAdapter):
 
 
 def _infer_profile(baseline_log_path):
-    with open(baseline_log_path, "r", errors="replace") as f:
-        lines = f.readlines()
-
-    ts_patterns = {
-        "iso": re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"),
-        "hms": re.compile(r"^\d{2}:\d{2}:\d{2}"),
-        "uptime": re.compile(r"^\[\d+(\.\d+)?\]"),
-    }
-    ts_counts = {name: 0 for name in ts_patterns}
+    ts_counts = Counter(dict.fromkeys(_TIMESTAMP_STYLES, 0))
     severity_tokens = Counter()
     module_prefix = Counter()
     templates = Counter()
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        for name, pattern in ts_patterns.items():
-            if pattern.search(line):
-                ts_counts[name] += 1
-        severity = _extract_severity(line)
-        if severity:
-            severity_tokens[severity] += 1
-        prefix = _extract_prefix(line)
-        if prefix:
-            module_prefix[prefix] += 1
-        templates[_templateize(line)] += 1
+    with open(baseline_log_path, "r", errors="replace") as f:
+        for block in iter(lambda: f.readlines(_READ_BLOCK_HINT), []):
+            nonempty = [line for line in (raw.strip() for raw in block) if line]
+            ts_counts.update(
+                match.lastgroup for match in map(_TIMESTAMP_RE.match, nonempty) if match
+            )
+            severity_tokens.update(filter(None, map(_extract_severity, nonempty)))
+            module_prefix.update(filter(None, map(_extract_prefix, nonempty)))
+            templates.update(map(_templateize, nonempty))
 
     dominant_ts = max(ts_counts, key=ts_counts.get) if any(ts_counts.values()) else "none"
     return {
@@ -101,32 +118,31 @@ def _infer_profile(baseline_log_path):
 
 
 def _extract_severity(line):
-    tokens = [
-        ("ERROR", re.compile(r"\bERROR\b|\bERR\b|\bE\b", re.IGNORECASE)),
-        ("WARN", re.compile(r"\bWARN(ING)?\b|\bWRN\b|\bW\b", re.IGNORECASE)),
-        ("INFO", re.compile(r"\bINFO\b|\bINF\b|\bI\b", re.IGNORECASE)),
-        ("DEBUG", re.compile(r"\bDEBUG\b|\bDBG\b|\bD\b", re.IGNORECASE)),
-    ]
-    for label, pattern in tokens:
-        if pattern.search(line):
+    found = None
+    for match in _SEVERITY_RE.finditer(line):
+        label = match.lastgroup
+        if label == "ERROR":
             return label
-    return None
+        if found is None or _SEVERITY_RANK[label] < _SEVERITY_RANK[found]:
+            found = label
+    return found
 
 
 def _extract_prefix(line):
-    match = re.match(r"^([A-Za-z0-9_/-]+):", line)
+    match = _PREFIX_RE.match(line)
     if match:
         return match.group(1)
     return None
 
 
 def _templateize(line):
-    line = re.sub(r"0x[0-9a-fA-F]+", "<hex>", line)
-    line = re.sub(r"\b\d+\b", "<int>", line)
-    line = re.sub(r"\b\d+\.\d+\b", "<float>", line)
-    line = re.sub(r"\b[a-zA-Z]+[0-9]+\b", "<id>", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+    line = _HEX_RE.sub("<hex>", line)
+    line = _TOKEN_RE.sub(_token_placeholder, line)
+    return " ".join(line.split())
+
+
+def _token_placeholder(match):
+    return _TOKEN_PLACEHOLDERS[match.lastgroup]
 
 
 def _parse_log(log_path, profile):
@@ -136,28 +152,33 @@ def _parse_log(log_path, profile):
         "reset_count": 0,
         "total_lines": 0,
     }
-    reset_re = re.compile(r"\bRESET\b", re.IGNORECASE)
-    templates = []
+    known = set(profile.get("templates", [])) if profile and profile.get("templates") else None
+    matched = 0
+    new_templates = set()
     with open(log_path, "r", errors="replace") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            counts["total_lines"] += 1
-            severity = _extract_severity(line)
-            if severity == "ERROR":
-                counts["error_count"] += 1
-            if severity == "WARN":
-                counts["warn_count"] += 1
-            if reset_re.search(line):
-                counts["reset_count"] += 1
-            templates.append(_templateize(line))
+        for block in iter(lambda: f.readlines(_READ_BLOCK_HINT), []):
+            for line in block:
+                line = line.strip()
+                if not line:
+                    continue
+                counts["total_lines"] += 1
+                severity = _extract_severity(line)
+                if severity == "ERROR":
+                    counts["error_count"] += 1
+                if severity == "WARN":
+                    counts["warn_count"] += 1
+                if _RESET_RE.search(line):
+                    counts["reset_count"] += 1
+                if known is not None:
+                    template = _templateize(line)
+                    if template in known:
+                        matched += 1
+                    else:
+                        new_templates.add(template)
 
     template_stats = {}
-    if profile and profile.get("templates"):
-        known = set(profile.get("templates", []))
-        matched = sum(1 for t in templates if t in known)
-        new_templates = sorted({t for t in templates if t not in known})
+    if known is not None:
+        new_templates = sorted(new_templates)
         template_stats = {
             "template_match_rate": round((matched / counts["total_lines"]) * 100, 2)
             if counts["total_lines"]
@@ -1,30 +1,34 @@
+import operator
+
 import yaml
 
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_asserts(path):
     with open(path, "r") as f:
-        payload = yaml.safe_load(f) or {}
+        payload = yaml.load(f, Loader=_YAML_LOADER) or {}
     return payload.get("asserts", [])
 
 
+_OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda actual, expected: actual in expected,
+    "not_in": lambda actual, expected: actual not in expected,
+}
+
+
 def _compare(op, actual, expected):
-    if op == "<":
-        return actual < expected
-    if op == "<=":
-        return actual <= expected
-    if op == ">":
-        return actual > expected
-    if op == ">=":
-        return actual >= expected
-    if op == "==":
-        return actual == expected
-    if op == "!=":
-        return actual != expected
-    if op == "in":
-        return actual in expected
-    if op == "not_in":
-        return actual not in expected
-    raise ValueError(f"unsupported op: {op}")
+    try:
+        fn = _OPS[op]
+    except (KeyError, TypeError):
+        raise ValueError(f"unsupported op: {op}") from None
+    return fn(actual, expected)
 
 
 def evaluate_asserts(asserts, metrics_map):
@@ -3,15 +3,21 @@ import os
 import time
 import uuid
 from dataclasses import dataclass
-from io import BytesIO
 from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 import yaml
 
 from hb.schema import load_schema
 from hb.perf import PerfRecorder
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_SCHEMA_SAMPLE_ROWS = 500
+
 
 @dataclass
 class CompareResult:
@@ -67,30 +73,32 @@ def _detect_delimiter(sample_bytes):
 def _infer_column_types(df):
     types = {}
     for col in df.columns:
-        series = df[col].astype(str).str.strip()
+        series = df[col].str.strip()
         non_empty = series[series != ""]
         if non_empty.empty:
             types[col] = "str"
             continue
         numeric = pd.to_numeric(non_empty, errors="coerce")
-        if numeric.notna().all():
-            if (numeric % 1 == 0).all():
-                types[col] = "int"
-            else:
-                types[col] = "float"
-        else:
+        if numeric.dtype.kind in "iu":
+            types[col] = "int"
+            continue
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        if np.isnan(values).any():
             types[col] = "str"
+            continue
+        with np.errstate(invalid="ignore"):
+            whole = (values % 1 == 0).all()
+        types[col] = "int" if whole else "float"
     return types
 
 
 def _build_schema_from_file(schema_name, sample_path, out_dir, require_all=False):
     with open(sample_path, "rb") as f:
-        sample_bytes = f.read()
-    delimiter = _detect_delimiter(sample_bytes)
+        delimiter = _detect_delimiter(f.readline())
     read_kwargs = {
         "dtype": str,
         "keep_default_na": False,
-        "nrows": 500,
+        "nrows": _SCHEMA_SAMPLE_ROWS,
         "encoding_errors": "replace",
     }
     if delimiter == "whitespace":
@@ -98,11 +106,13 @@ def _build_schema_from_file(schema_name, sample_path, out_dir, require_all=False
         read_kwargs["engine"] = "python"
     else:
         read_kwargs["sep"] = delimiter
+    # Read from the file so pandas decides where records end (quoted fields
+    # may span lines); nrows stops it after the sampled rows.
     try:
-        df = pd.read_csv(BytesIO(sample_bytes), **read_kwargs)
+        df = pd.read_csv(sample_path, **read_kwargs)
     except UnicodeDecodeError:
         read_kwargs["encoding"] = "latin1"
-        df = pd.read_csv(BytesIO(sample_bytes), **read_kwargs)
+        df = pd.read_csv(sample_path, **read_kwargs)
     if df.empty or not df.columns.tolist():
         raise ValueError("No header row detected in baseline file.")
     columns = df.columns.tolist()
@@ -123,14 +133,14 @@ def _build_schema_from_file(schema_name, sample_path, out_dir, require_all=False
     _ensure_dirs(schema_dir)
     schema_path = os.path.join(schema_dir, f"{schema_name}.yaml")
     with open(schema_path, "w") as f:
-        yaml.safe_dump(schema, f, sort_keys=False)
+        yaml.dump(schema, f, Dumper=_YAML_DUMPER, sort_keys=False)
     return schema_path
 
 
 def _build_custom_registry(schema_path, out_dir):
     registry_path = os.environ.get("HB_METRIC_REGISTRY", "metric_registry.yaml")
     with open(registry_path, "r") as f:
-        registry = yaml.safe_load(f) or {}
+        registry = yaml.load(f, Loader=_YAML_LOADER) or {}
     metrics = registry.get("metrics", {})
     schema = load_schema(schema_path)
     column_types = schema.get("column_types", {}) or {}
@@ -151,7 +161,7 @@ def _build_custom_registry(schema_path, out_dir):
     _ensure_dirs(logs_dir)
     out_path = os.path.join(logs_dir, f"metric_registry_custom_{uuid.uuid4().hex}.yaml")
     with open(out_path, "w") as f:
-        yaml.safe_dump(registry, f, sort_keys=False)
+        yaml.dump(registry, f, Dumper=_YAML_DUMPER, sort_keys=False)
     return out_path
 
 
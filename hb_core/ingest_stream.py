@@ -1,6 +1,10 @@
-import csv
 import json
 
+import pandas as pd
+
+_CHUNK_ROWS = 100_000
+_READ_BUFFER = 1 << 20
+
 
 class Welford:
     def __init__(self):
@@ -21,6 +25,19 @@ class Welford:
         if self.max is None or value > self.max:
             self.max = value
 
+    def merge(self, count, mean, m2, min_value, max_value):
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        if self.min is None or min_value < self.min:
+            self.min = min_value
+        if self.max is None or max_value > self.max:
+            self.max = max_value
+
     def summary(self):
         variance = self.m2 / self.count if self.count else 0.0
         std = variance ** 0.5
@@ -34,37 +51,66 @@ class Welford:
         }
 
 
+def _merge_chunk(stats, metrics, values):
+    if values.empty:
+        return
+    grouped = values.groupby(metrics.to_numpy(), sort=False)
+    counts = grouped.count()
+    means = grouped.mean()
+    m2s = grouped.var(ddof=0) * counts
+    mins = grouped.min()
+    maxs = grouped.max()
+    for metric in counts.index:
+        agg = stats.get(metric)
+        if agg is None:
+            agg = Welford()
+            stats[metric] = agg
+        agg.merge(
+            int(counts[metric]),
+            float(means[metric]),
+            float(m2s[metric]),
+            float(mins[metric]),
+            float(maxs[metric]),
+        )
+
+
 def aggregate_csv(path, metric_col="metric", value_col="value"):
     stats = {}
-    with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            metric = row.get(metric_col)
-            value = row.get(value_col)
-            if not metric or value in (None, ""):
-                continue
-            try:
-                value = float(value)
-            except ValueError:
-                continue
-            agg = stats.get(metric)
-            if agg is None:
-                agg = Welford()
-                stats[metric] = agg
-            agg.update(value)
+    try:
+        reader = pd.read_csv(
+            path,
+            usecols=lambda col: col in (metric_col, value_col),
+            dtype=str,
+            keep_default_na=False,
+            chunksize=_CHUNK_ROWS,
+        )
+        for chunk in reader:
+            if metric_col not in chunk or value_col not in chunk:
+                break
+            metrics = chunk[metric_col]
+            values = pd.to_numeric(chunk[value_col], errors="coerce")
+            keep = metrics.notna() & (metrics != "") & values.notna()
+            _merge_chunk(stats, metrics[keep], values[keep])
+    except pd.errors.EmptyDataError:
+        pass
     return {metric: agg.summary() for metric, agg in stats.items()}
 
 
 def aggregate_jsonl(path, metric_key="metric", value_key="value"):
     stats = {}
-    with open(path, "r") as f:
+    metrics = []
+    values = []
+    # A non-ASCII key may be written raw or \u-escaped, so only ASCII keys
+    # have a single byte form to prefilter on.
+    needle = json.dumps(metric_key).encode("utf-8") if metric_key.isascii() else None
+    with open(path, "rb", buffering=_READ_BUFFER) as f:
         for line in f:
-            line = line.strip()
-            if not line:
+            # Skip lines that cannot carry the metric key without decoding them.
+            if needle is not None and needle not in line:
                 continue
             try:
                 payload = json.loads(line)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
             metric = payload.get(metric_key)
             value = payload.get(value_key)
@@ -74,9 +120,11 @@ def aggregate_jsonl(path, metric_key="metric", value_key="value"):
                 value = float(value)
             except ValueError:
                 continue
-            agg = stats.get(metric)
-            if agg is None:
-                agg = Welford()
-                stats[metric] = agg
-            agg.update(value)
+            metrics.append(metric)
+            values.append(value)
+            if len(values) >= _CHUNK_ROWS:
+                _merge_chunk(stats, pd.Series(metrics, dtype=object), pd.Series(values, dtype=float))
+                metrics = []
+                values = []
+    _merge_chunk(stats, pd.Series(metrics, dtype=object), pd.Series(values, dtype=float))
     return {metric: agg.summary() for metric, agg in stats.items()}
@@ -1,4 +1,7 @@
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
@@ -7,10 +10,47 @@ from hb.registry_utils import normalize_alias
 from hb.schema import load_smap_msl_telemetry_schema
 
 
+logger = logging.getLogger(__name__)
+
+_SMALL_NPY_BYTES = 1 << 20
+_STATS_BLOCK = 1 << 15
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+_column_index_cache = {}
+_channel_path_cache = {}
+_CHANNEL_PATH_CACHE_SIZE = 4096
+_RESOLVED_COLUMNS_SIZE = 1024
+
+
 class TelemetrySchemaError(ValueError):
     pass
 
 
+@dataclass
+class TelemetrySeries:
+    index: np.ndarray
+    value: np.ndarray
+    index_sorted: bool = False
+
+    def __len__(self):
+        return len(self.value)
+
+    @property
+    def empty(self):
+        return self.value.size == 0
+
+    def between(self, start_index, end_index):
+        if self.index_sorted:
+            lo = np.searchsorted(self.index, start_index, side="left")
+            hi = np.searchsorted(self.index, end_index, side="right")
+            return TelemetrySeries(self.index[lo:hi], self.value[lo:hi], True)
+        mask = (self.index >= start_index) & (self.index <= end_index)
+        return TelemetrySeries(self.index[mask], self.value[mask])
+
+
 def _base_data_dir(root):
     data_dir = os.path.join(root, "data")
     nested = os.path.join(data_dir, "data")
@@ -19,14 +59,35 @@ def _base_data_dir(root):
     return data_dir
 
 
+def _sorted_unique(paths):
+    if len(paths) <= 1:
+        return paths
+    return sorted(set(paths))
+
+
 def _find_candidate_files(root, chan_id, split=None):
     data_dir = _base_data_dir(root)
     if not os.path.isdir(data_dir):
         raise TelemetrySchemaError(f"SCHEMA_ERROR: missing data directory: {data_dir}")
 
+    if split:
+        # The usual request names an existing file in the split directory
+        # exactly; a stat or two settles it without listing the directory.
+        split_dir = os.path.join(data_dir, split)
+        exact = [
+            path
+            for path in (os.path.join(split_dir, f"{chan_id}.csv"), os.path.join(split_dir, f"{chan_id}.npy"))
+            if os.path.isfile(path)
+        ]
+        if exact:
+            return exact
+
     chan_lower = chan_id.lower()
     preferred_names = {f"{chan_id}.npy", f"{chan_id}.csv"}
     preferred_lower = {name.lower() for name in preferred_names}
+    # ASCII names can only match if they have the preferred length, so most
+    # entries are rejected without building a lowercased copy.
+    preferred_len = len(chan_id) + 4 if chan_id.isascii() else None
 
     matches = []
     preferred_dirs = []
@@ -37,42 +98,74 @@ def _find_candidate_files(root, chan_id, split=None):
     for idx, directory in enumerate(preferred_dirs):
         if not os.path.isdir(directory):
             continue
-        for name in os.listdir(directory):
-            lower = name.lower()
-            if lower in preferred_lower:
-                matches.append(os.path.join(directory, name))
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if preferred_len is not None and len(name) != preferred_len and name.isascii():
+                    continue
+                if name in preferred_names or name.lower() in preferred_lower:
+                    matches.append(entry.path)
         if matches and split and idx == 0:
-            return sorted(set(matches))
+            return _sorted_unique(matches)
 
     if matches:
-        return sorted(set(matches))
-
-    for root_dir, _, files in os.walk(data_dir):
-        for name in files:
-            lower = name.lower()
-            if not lower.endswith((".npy", ".csv")):
-                continue
-            if chan_lower in lower:
-                matches.append(os.path.join(root_dir, name))
+        return _sorted_unique(matches)
 
-    return sorted(set(matches))
+    pending = [data_dir]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, list symlinked directories but do not descend.
+                    if not entry.is_symlink():
+                        pending.append(entry.path)
+                    continue
+                lower = entry.name.lower()
+                if lower.endswith((".npy", ".csv")) and chan_lower in lower:
+                    matches.append(entry.path)
+
+    return _sorted_unique(matches)
 
 
 def resolve_channel_path(root, spacecraft, chan_id, split=None):
+    key = (root, spacecraft, chan_id, split)
+    cached = _channel_path_cache.get(key)
+    if cached is not None:
+        if os.path.isfile(cached):
+            return cached
+        _channel_path_cache.pop(key, None)
+
     matches = _find_candidate_files(root, chan_id, split=split)
     if not matches:
         raise TelemetrySchemaError(
             f"SCHEMA_ERROR: no telemetry file found for {spacecraft} {chan_id} under {root}"
         )
     if len(matches) > 1:
-        print(
-            "schema warning: multiple telemetry matches for"
-            f" {spacecraft} {chan_id}; using {os.path.basename(matches[0])}"
+        logger.warning(
+            "schema warning: multiple telemetry matches for %s %s; using %s",
+            spacecraft,
+            chan_id,
+            os.path.basename(matches[0]),
         )
+    if len(_channel_path_cache) >= _CHANNEL_PATH_CACHE_SIZE:
+        _channel_path_cache.clear()
+    _channel_path_cache[key] = matches[0]
     return matches[0]
 
 
-def _build_column_map(columns, schema):
+def _column_index(schema):
+    cached = _column_index_cache.get(id(schema))
+    if cached and cached["schema"] is schema:
+        return cached["index"]
+
     required = schema.get("required_columns", [])
     optional = schema.get("optional_columns", [])
     allow_extra = schema.get("allow_extra_columns", True)
@@ -84,20 +177,43 @@ def _build_column_map(columns, schema):
         for name in names:
             alias_map[normalize_alias(name)] = canonical_norm
 
-    required_norm = {normalize_alias(name) for name in required}
-    optional_norm = {normalize_alias(name) for name in optional}
+    required_norm = frozenset(normalize_alias(name) for name in required)
+    optional_norm = frozenset(normalize_alias(name) for name in optional)
     known_norm = required_norm | optional_norm
 
+    # Raw header text -> canonical name, seeded with the spellings the schema
+    # itself uses and extended as new headers are seen.
+    resolved = {}
+    spellings = [*required, *optional, *(name for names in aliases.values() for name in names)]
+    for name in spellings:
+        normalized = normalize_alias(str(name))
+        resolved[str(name)] = alias_map.get(normalized, normalized)
+
+    index = (alias_map, resolved, required_norm, known_norm, allow_extra)
+    # Only the current schema is kept; holding it keeps its id from being reused.
+    _column_index_cache.clear()
+    _column_index_cache[id(schema)] = {"schema": schema, "index": index}
+    return index
+
+
+def _build_column_map(columns, schema):
+    alias_map, resolved, required_norm, known_norm, allow_extra = _column_index(schema)
+
     col_map = {}
     extras = []
     for name in columns:
         if not name:
             continue
-        normalized = normalize_alias(str(name))
-        canonical = alias_map.get(normalized, normalized)
+        raw = str(name)
+        canonical = resolved.get(raw)
+        if canonical is None:
+            normalized = normalize_alias(raw)
+            canonical = alias_map.get(normalized, normalized)
+            if len(resolved) < _RESOLVED_COLUMNS_SIZE:
+                resolved[raw] = canonical
         col_map[canonical] = name
         if canonical not in known_norm:
-            extras.append(str(name))
+            extras.append(raw)
 
     missing = [name for name in required_norm if name not in col_map]
     if missing:
@@ -115,63 +231,160 @@ def _build_column_map(columns, schema):
 
 
 def _coerce_numeric(series, field):
-    numeric = pd.to_numeric(series, errors="coerce")
-    invalid = numeric.isna().any()
+    numeric = pd.to_numeric(series, errors="coerce").to_numpy()
+    # Unparseable cells can only surface as NaN, so integer results need no scan.
+    # A NaN always poisons the sum, so a finite or infinite total rules it out
+    # without allocating a mask; only a NaN total needs the exact check.
+    if numeric.dtype.kind == "f":
+        with np.errstate(invalid="ignore", over="ignore"):
+            invalid = np.isnan(numeric.sum()) and np.isnan(numeric).any()
+    elif numeric.dtype.kind in "iub":
+        invalid = False
+    else:
+        invalid = pd.isna(numeric).any()
     if invalid:
         return None, True
     return numeric, False
 
 
-def load_series_from_path(path):
+def _fast_load_npy(path):
+    with open(path, "rb") as f:
+        read_header = _NPY_HEADER_READERS.get(np.lib.format.read_magic(f))
+        if read_header is None:
+            return None
+        shape, fortran_order, dtype = read_header(f)
+        if dtype.hasobject:
+            return None
+        count = int(np.prod(shape, dtype=np.int64))
+        values = np.frombuffer(f.read(), dtype=dtype, count=count)
+    return values.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _load_npy(path):
+    # Small channels are read in one call; larger ones are memory-mapped so
+    # rows are paged in on access.
+    if os.path.getsize(path) <= _SMALL_NPY_BYTES:
+        values = _fast_load_npy(path)
+        if values is not None:
+            return values
+    return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+def _read_numeric_columns(path, usecols):
+    # Let the C parser convert the needed columns straight to numbers; any
+    # column it cannot type as numeric goes through the string path instead.
+    try:
+        df = pd.read_csv(path, usecols=usecols, na_filter=False, low_memory=False)
+    except (ValueError, pd.errors.ParserError):
+        return None
+    if any(df[col].dtype.kind not in "iuf" for col in usecols):
+        return None
+    return df
+
+
+def load_series_from_path(path, dtype=None, header_bytes=None):
     schema = load_smap_msl_telemetry_schema()
     ext = os.path.splitext(path)[1].lower()
     if ext == ".npy":
-        values = np.load(path, allow_pickle=False)
+        if dtype is not None and header_bytes is not None:
+            # Trusted layout supplied by the caller: skip header parsing.
+            values = np.fromfile(path, dtype=dtype, offset=header_bytes)
+        else:
+            values = _load_npy(path)
         values = np.asarray(values).reshape(-1)
         if values.size == 0:
             raise TelemetrySchemaError(f"SCHEMA_ERROR: no rows found in {path}")
-        series = pd.DataFrame({"index": range(len(values)), "value": values.astype(float)})
-        return series
+        return TelemetrySeries(
+            np.arange(len(values), dtype=np.int64),
+            values.astype(np.float64, copy=False),
+            True,
+        )
 
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
-    if df.empty:
+    header = pd.read_csv(path, dtype=str, keep_default_na=False, nrows=1)
+    if header.empty:
         raise TelemetrySchemaError(f"SCHEMA_ERROR: no rows found in {path}")
 
-    col_map, extras, allow_extra = _build_column_map(df.columns, schema)
+    col_map, extras, allow_extra = _build_column_map(header.columns, schema)
     if extras and allow_extra:
-        print(f"schema warning: extra columns ignored: {', '.join(extras)}")
+        logger.warning("schema warning: extra columns ignored: %s", ", ".join(extras))
 
     value_col = col_map["value"]
+    index_col = col_map.get("index")
+    usecols = [value_col] if index_col is None else [value_col, index_col]
+
+    df = _read_numeric_columns(path, usecols)
+    if df is None:
+        df = pd.read_csv(path, usecols=usecols, dtype=str, keep_default_na=False)
+
     values, invalid = _coerce_numeric(df[value_col], "value")
     if invalid:
         raise TelemetrySchemaError("SCHEMA_ERROR: invalid values in columns: value")
 
-    if "index" in col_map:
-        index_values, invalid = _coerce_numeric(df[col_map["index"]], "index")
+    if index_col is not None:
+        index_values, invalid = _coerce_numeric(df[index_col], "index")
         if invalid:
             raise TelemetrySchemaError("SCHEMA_ERROR: invalid values in columns: index")
         indices = index_values.astype(int)
+        index_sorted = bool((indices[1:] >= indices[:-1]).all())
     else:
-        indices = pd.Series(range(len(df)), dtype=int)
+        indices = np.arange(len(df), dtype=int)
+        index_sorted = True
 
-    series = pd.DataFrame({"index": indices, "value": values.astype(float)})
-    return series
+    return TelemetrySeries(indices, values.astype(float), index_sorted)
 
 
-def load_series(root, spacecraft, chan_id, split=None):
+def load_series(root, spacecraft, chan_id, split=None, dtype=None, header_bytes=None):
     path = resolve_channel_path(root, spacecraft, chan_id, split=split)
-    return load_series_from_path(path)
+    return load_series_from_path(path, dtype=dtype, header_bytes=header_bytes)
+
+
+def _mean_std(values):
+    # One sweep over memory: each cache-sized block is reduced to its own
+    # count/mean/m2 and folded in with Chan's update, which stays stable for
+    # offset data where sum-of-squares would cancel.
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    scratch = np.empty(min(_STATS_BLOCK, values.size))
+    with np.errstate(invalid="ignore", over="ignore"):
+        for start in range(0, values.size, _STATS_BLOCK):
+            block = values[start:start + _STATS_BLOCK]
+            size = block.size
+            block_mean = block.sum() / size
+            deviation = np.subtract(block, block_mean, out=scratch[:size])
+            block_m2 = np.dot(deviation, deviation)
+            total = count + size
+            delta = block_mean - mean
+            mean += delta * size / total
+            m2 += block_m2 + delta * delta * count * size / total
+            count = total
+    if np.isfinite(mean) and np.isfinite(m2):
+        return float(mean), float(np.sqrt(m2 / count))
+    return _mean_std_skipna(values)
+
+
+def _mean_std_skipna(values):
+    # Matches pandas' skipna mean/std(ddof=0) for series holding NaN or inf.
+    missing = np.isnan(values)
+    if not missing.any():
+        return float(values.mean()), float(values.std())
+    count = values.size - int(missing.sum())
+    if not count:
+        return float("nan"), float("nan")
+    mean = np.where(missing, 0.0, values).sum() / count
+    deviation = np.where(missing, 0.0, values - mean)
+    return float(mean), float(np.sqrt((deviation * deviation).sum() / count))
 
 
 def metrics_from_series(series, sample_size=1000):
     if series.empty:
         raise TelemetrySchemaError("SCHEMA_ERROR: no rows found")
-    values = series["value"].astype(float)
-    mean = float(values.mean())
-    std = float(values.std(ddof=0))
+    values = np.asarray(series.value, dtype=float)
+    mean, std = _mean_std(values)
 
     if len(values) > sample_size:
-        samples = values.sample(n=sample_size, random_state=0).tolist()
+        picks = np.random.default_rng(0).choice(len(values), size=sample_size, replace=False)
+        samples = values[picks].tolist()
     else:
         samples = values.tolist()
 
@@ -190,10 +403,24 @@ def parse(root, spacecraft, chan_id, start_index=None, end_index=None, split=Non
     series = load_series(root, spacecraft, chan_id, split=split)
     if start_index is not None or end_index is not None:
         if start_index is None:
-            start_index = int(series["index"].min())
+            start_index = int(series.index.min())
         if end_index is None:
-            end_index = int(series["index"].max())
-        subset = series[(series["index"] >= start_index) & (series["index"] <= end_index)]
+            end_index = int(series.index.max())
+        subset = series.between(start_index, end_index)
     else:
         subset = series
     return metrics_from_series(subset)
+
+
+def parse_many(root, spacecraft, chan_ids, start_index=None, end_index=None, split=None, max_workers=8):
+    chan_ids = list(chan_ids)
+    if not chan_ids:
+        return {}
+    # Channel loads are dominated by file reads and numpy/pandas C code, which
+    # release the GIL, so threads overlap them well.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chan_ids))) as pool:
+        futures = [
+            pool.submit(parse, root, spacecraft, chan_id, start_index, end_index, split)
+            for chan_id in chan_ids
+        ]
+        return {chan_id: future.result() for chan_id, future in zip(chan_ids, futures)}
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import functools
 import hashlib
 import html
 import json
+import mmap
 import os
 import re
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 
@@ -36,6 +39,15 @@ EXIT_UNKNOWN = 1
 LOG_LEVEL = "info"
 LOG_ORDER = {"debug": 10, "info": 20, "error": 30}
 
+_HASH_CHUNK = 1 << 20
+_HASH_MMAP_BYTES = 4 << 20
+
+_schema_cache = {}
+_thresholds_cache = {}
+_templates_cache = {}
+
+_VALUE_RE = re.compile(r"^([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)\s*([a-zA-Z]+)?$")
+
 
 def log(message, level="info"):
     if LOG_ORDER[level] < LOG_ORDER[LOG_LEVEL]:
@@ -57,33 +69,61 @@ def parse_number(value):
         return None
 
 
+def _plain_number(text):
+    # Unit-less ASCII integers and decimals are what the regex below would
+    # accept without a unit; convert them directly and leave the rest to it.
+    digits = text[1:] if text[0] in "+-" else text
+    if not digits.isascii():
+        return None
+    if digits.isdigit():
+        return int(text)
+    whole, dot, frac = digits.partition(".")
+    if dot and frac.isdigit() and (not whole or whole.isdigit()):
+        return float(text)
+    return None
+
+
 def parse_value(value):
     if value is None:
         return None, None
     if isinstance(value, (int, float)):
         return value, None
-    text = str(value).strip()
+    return _parse_value_str(str(value))
+
+
+def _parse_value_str(raw):
+    # Loaders that only ever see strings (CSV cells, log values) call this
+    # directly and skip parse_value's type checks.
+    text = raw.strip()
     if text == "":
         return None, None
-    match = re.match(r"^([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)\s*([a-zA-Z]+)?$", text)
+    number = _plain_number(text)
+    if number is not None:
+        return number, None
+    match = _VALUE_RE.match(text)
     if not match:
-        raise ParseError(f"invalid metric value: {value}")
+        raise ParseError(f"invalid metric value: {raw}")
     number_text = match.group(1)
     number = parse_number(number_text)
     if number is None:
-        raise ParseError(f"invalid metric value: {value}")
+        raise ParseError(f"invalid metric value: {raw}")
     unit = match.group(2).lower() if match.group(2) else None
     return number, unit
 
 
 def load_schema(path):
     try:
+        mtime = os.stat(path).st_mtime_ns
+        cached = _schema_cache.get(path)
+        if cached and cached["mtime"] == mtime:
+            return cached["schema"]
         with open(path, "r") as f:
             schema = json.load(f)
     except OSError as exc:
         raise ConfigError(f"schema file not found: {path}") from exc
     except json.JSONDecodeError as exc:
         raise ConfigError(f"invalid schema JSON: {path}") from exc
+    _schema_cache[path] = {"mtime": mtime, "schema": schema}
     return schema
 
 
@@ -121,15 +161,24 @@ def apply_schema(metrics, schema):
 def file_hash(path):
     hasher = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            hasher.update(chunk)
+        if os.fstat(f.fileno()).st_size > _HASH_MMAP_BYTES:
+            # Hash the mapped file in one update() call instead of copying it
+            # through Python in chunks.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                hasher.update(chunk)
     return hasher.hexdigest()
 
 
 def compute_run_id(run_path, baseline_path, config_path):
     hasher = hashlib.sha256()
-    for path in [run_path, baseline_path]:
-        hasher.update(file_hash(path).encode("utf-8"))
+    # hashlib releases the GIL while hashing, so the two inputs hash in parallel.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        digests = list(pool.map(file_hash, [run_path, baseline_path]))
+    for digest in digests:
+        hasher.update(digest.encode("utf-8"))
     if config_path and os.path.exists(config_path):
         hasher.update(file_hash(config_path).encode("utf-8"))
     return hasher.hexdigest()[:12]
@@ -138,45 +187,42 @@ def compute_run_id(run_path, baseline_path, config_path):
 def load_metrics_csv(path):
     metrics = {}
     with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames is None:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
             raise ParseError("CSV missing header row")
-        fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        fieldnames = [name.strip().lower() for name in header]
         if "metric" not in fieldnames or "value" not in fieldnames:
             raise ParseError("CSV must include 'metric' and 'value' columns")
         metric_idx = fieldnames.index("metric")
         value_idx = fieldnames.index("value")
         for row in reader:
-            values = list(row.values())
-            metric_name = values[metric_idx].strip()
+            if len(row) <= metric_idx:
+                continue
+            metric_name = row[metric_idx].strip()
             if metric_name == "":
                 continue
-            metrics[metric_name] = parse_value(values[value_idx])
+            if len(row) > value_idx:
+                metrics[metric_name] = _parse_value_str(row[value_idx])
+            else:
+                metrics[metric_name] = (None, None)
     return metrics
 
 
-def load_metrics_excel(path):
-    try:
-        import openpyxl
-    except ImportError as exc:
-        raise ConfigError(
-            "Excel ingestion requires openpyxl. Install with: pip install openpyxl"
-        ) from exc
-
-    workbook = openpyxl.load_workbook(path, data_only=True)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-    if not rows:
+def _metrics_from_rows(rows):
+    rows = iter(rows)
+    header_row = next(rows, None)
+    if header_row is None:
         return {}
 
-    headers = [str(cell).strip().lower() for cell in rows[0] if cell is not None]
+    headers = [str(cell).strip().lower() for cell in header_row if cell is not None]
     if "metric" not in headers or "value" not in headers:
         raise ParseError("Excel sheet must include 'metric' and 'value' columns")
     metric_idx = headers.index("metric")
     value_idx = headers.index("value")
 
     metrics = {}
-    for row in rows[1:]:
+    for row in rows:
         if row is None or len(row) <= max(metric_idx, value_idx):
             continue
         metric_cell = row[metric_idx]
@@ -186,10 +232,30 @@ def load_metrics_excel(path):
         metric_name = str(metric_cell).strip()
         if metric_name == "":
             continue
-        metrics[metric_name] = parse_value(value_cell)
+        if isinstance(value_cell, (int, float)):
+            metrics[metric_name] = (value_cell, None)
+        else:
+            metrics[metric_name] = parse_value(value_cell)
     return metrics
 
 
+def load_metrics_excel(path):
+    try:
+        import openpyxl
+    except ImportError as exc:
+        raise ConfigError(
+            "Excel ingestion requires openpyxl. Install with: pip install openpyxl"
+        ) from exc
+
+    # Read-only mode streams rows from the sheet XML instead of building the
+    # whole workbook in memory; it must be closed explicitly.
+    workbook = openpyxl.load_workbook(path, data_only=True, read_only=True)
+    try:
+        return _metrics_from_rows(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
 def load_metrics_log(path):
     metrics = {}
     with open(path, "r") as f:
@@ -209,7 +275,7 @@ def load_metrics_log(path):
             value = parts[1].strip() if len(parts) > 1 else ""
             if metric_name == "":
                 continue
-            metrics[metric_name] = parse_value(value)
+            metrics[metric_name] = _parse_value_str(value)
     return metrics
 
 
@@ -235,11 +301,13 @@ def validate_metrics(label, metrics):
 
 def normalize_metric_value(name, value_tuple, thresholds):
     value, unit = value_tuple
+    config = thresholds.get(name, {})
+    return _scale_value(name, value, unit, config.get("unit_map") or {}, config.get("unit"))
+
+
+def _scale_value(name, value, unit, unit_map, canonical):
     if value is None:
         return None, None
-    config = thresholds.get(name, {})
-    unit_map = config.get("unit_map") or {}
-    canonical = config.get("unit")
     if unit is None:
         return value, canonical
     if unit_map:
@@ -249,7 +317,22 @@ def normalize_metric_value(name, value_tuple, thresholds):
     raise ValidationError(f"unit provided for {name} but no unit_map configured")
 
 
+_THRESHOLD_FIELDS = {
+    "drift_threshold": parse_number,
+    "type": str,
+    "unit": str.lower,
+}
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
 def load_thresholds(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _thresholds_cache.get(path)
+    if cached and cached["mtime"] == mtime:
+        return cached["thresholds"]
     thresholds = {}
     current_metric = None
     in_metrics = False
@@ -257,16 +340,17 @@ def load_thresholds(path):
     with open(path, "r") as f:
         for raw in f:
             line = raw.rstrip("\n")
-            if line.strip() == "" or line.strip().startswith("#"):
+            stripped = line.strip()
+            if stripped == "" or stripped.startswith("#"):
                 continue
-            if line.strip() == "metrics:":
+            if stripped == "metrics:":
                 in_metrics = True
                 continue
             if not in_metrics:
                 continue
-            if line.startswith("  ") and not line.startswith("    "):
-                key = line.strip().rstrip(":")
-                current_metric = key
+            indent = _indent(line)
+            if indent in (2, 3):
+                current_metric = stripped.rstrip(":")
                 thresholds[current_metric] = {
                     "drift_threshold": None,
                     "type": None,
@@ -275,60 +359,79 @@ def load_thresholds(path):
                 }
                 in_unit_map = False
                 continue
-            if line.startswith("      ") and current_metric and in_unit_map:
-                entry = line.strip()
-                if ":" in entry:
-                    key, value = entry.split(":", 1)
+            if indent >= 6 and current_metric and in_unit_map:
+                key, sep, value = stripped.partition(":")
+                if sep:
                     thresholds[current_metric]["unit_map"][key.strip().lower()] = parse_number(
                         value.strip()
                     )
                 continue
-            if line.startswith("    ") and current_metric:
-                entry = line.strip()
-                if entry.startswith("drift_threshold:"):
-                    value = entry.split(":", 1)[1].strip()
-                    thresholds[current_metric]["drift_threshold"] = parse_number(value)
-                    in_unit_map = False
-                elif entry.startswith("type:"):
-                    thresholds[current_metric]["type"] = entry.split(":", 1)[1].strip()
+            if indent >= 4 and current_metric:
+                key, sep, value = stripped.partition(":")
+                if not sep:
+                    continue
+                convert = _THRESHOLD_FIELDS.get(key)
+                if convert is not None:
+                    thresholds[current_metric][key] = convert(value.strip())
                     in_unit_map = False
-                elif entry.startswith("unit:"):
-                    thresholds[current_metric]["unit"] = entry.split(":", 1)[1].strip().lower()
-                    in_unit_map = False
-                elif entry.startswith("unit_map:"):
+                elif key == "unit_map":
                     in_unit_map = True
+    _thresholds_cache[path] = {"mtime": mtime, "thresholds": thresholds}
     return thresholds
 
 
 def load_templates(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _templates_cache.get(path)
+    if cached and cached["mtime"] == mtime:
+        return cached["templates"]
     templates = {}
     current_template = None
     in_templates = False
     with open(path, "r") as f:
         for raw in f:
             line = raw.rstrip("\n")
-            if line.strip() == "" or line.strip().startswith("#"):
+            stripped = line.strip()
+            if stripped == "" or stripped.startswith("#"):
                 continue
-            if line.strip() == "templates:":
+            if stripped == "templates:":
                 in_templates = True
                 continue
             if not in_templates:
                 continue
-            if line.startswith("  ") and not line.startswith("    "):
-                current_template = line.strip().rstrip(":")
+            indent = _indent(line)
+            if indent in (2, 3):
+                current_template = stripped.rstrip(":")
                 templates[current_template] = []
                 continue
-            if line.startswith("    -") and current_template:
-                metric = line.split("-", 1)[1].strip()
+            if indent == 4 and stripped.startswith("-") and current_template:
+                metric = stripped[1:].strip()
                 if metric:
                     templates[current_template].append(metric)
+    _templates_cache[path] = {"mtime": mtime, "templates": templates}
     return templates
 
 
+def connect_registry(path):
+    conn = sqlite3.connect(path)
+    # WAL with synchronous=NORMAL syncs at checkpoints rather than on every
+    # commit, which is still durable against application crashes. Read-only
+    # and network filesystems may refuse WAL; keep the default journal there.
+    try:
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    except sqlite3.OperationalError:
+        journal_mode = None
+    if journal_mode == "wal":
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
 def init_registry(path):
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        conn = sqlite3.connect(path)
+        conn = connect_registry(path)
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS runs (
@@ -370,43 +473,55 @@ def init_registry(path):
         raise RegistryError(f"failed to init registry: {exc}") from exc
 
 
+_UPSERT_RUN_SQL = """
+    INSERT INTO runs (
+        run_id, baseline_id, run_path, baseline_path, config_path, config_hash, summary,
+        metrics_count, drift_count, created_at, report_dir, report_path,
+        diff_path, summary_path
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(run_id) DO UPDATE SET
+        config_hash=excluded.config_hash,
+        summary=excluded.summary,
+        metrics_count=excluded.metrics_count,
+        drift_count=excluded.drift_count,
+        created_at=excluded.created_at,
+        report_dir=excluded.report_dir,
+        report_path=excluded.report_path,
+        diff_path=excluded.diff_path,
+        summary_path=excluded.summary_path
+"""
+
+
+def _run_row(payload):
+    return (
+        payload["run_id"],
+        payload["baseline_id"],
+        payload["run_path"],
+        payload["baseline_path"],
+        payload["config_path"],
+        payload["config_hash"],
+        payload["summary"],
+        payload["metrics_count"],
+        payload["drift_count"],
+        payload["created_at"],
+        payload["report_dir"],
+        payload["report_path"],
+        payload["diff_path"],
+        payload["summary_path"],
+    )
+
+
 def upsert_run(conn, payload):
     try:
-        conn.execute(
-            """
-            INSERT INTO runs (
-                run_id, baseline_id, run_path, baseline_path, config_path, config_hash, summary,
-                metrics_count, drift_count, created_at, report_dir, report_path,
-                diff_path, summary_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(run_id) DO UPDATE SET
-                config_hash=excluded.config_hash,
-                summary=excluded.summary,
-                metrics_count=excluded.metrics_count,
-                drift_count=excluded.drift_count,
-                created_at=excluded.created_at,
-                report_dir=excluded.report_dir,
-                report_path=excluded.report_path,
-                diff_path=excluded.diff_path,
-                summary_path=excluded.summary_path
-            """,
-            (
-                payload["run_id"],
-                payload["baseline_id"],
-                payload["run_path"],
-                payload["baseline_path"],
-                payload["config_path"],
-                payload["config_hash"],
-                payload["summary"],
-                payload["metrics_count"],
-                payload["drift_count"],
-                payload["created_at"],
-                payload["report_dir"],
-                payload["report_path"],
-                payload["diff_path"],
-                payload["summary_path"],
-            ),
-        )
+        conn.execute(_UPSERT_RUN_SQL, _run_row(payload))
+        conn.commit()
+    except sqlite3.Error as exc:
+        raise RegistryError(f"failed to write registry: {exc}") from exc
+
+
+def upsert_runs(conn, payloads):
+    try:
+        conn.executemany(_UPSERT_RUN_SQL, [_run_row(payload) for payload in payloads])
         conn.commit()
     except sqlite3.Error as exc:
         raise RegistryError(f"failed to write registry: {exc}") from exc
@@ -481,28 +596,25 @@ def compare_metrics(baseline, current, thresholds, metric_names=None):
     if metric_names is None:
         metric_names = sorted(set(baseline.keys()) | set(current.keys()))
     for name in metric_names:
-        base_raw = baseline.get(name)
-        curr_raw = current.get(name)
         config = thresholds.get(name, {})
         threshold = config.get("drift_threshold")
+        unit = config.get("unit")
+        base_val = None
+        curr_val = None
+        delta = None
         if name not in baseline:
             status = "missing_baseline"
-            delta = None
-            unit = config.get("unit")
-            base_val = None
-            curr_val = None
         elif name not in current:
             status = "missing_current"
-            delta = None
-            unit = config.get("unit")
-            base_val = None
-            curr_val = None
         else:
-            base_val, base_unit = normalize_metric_value(name, base_raw, thresholds)
-            curr_val, curr_unit = normalize_metric_value(name, curr_raw, thresholds)
-            unit = config.get("unit") or base_unit or curr_unit
+            # Look the unit config up once for both sides.
+            unit_map = config.get("unit_map") or {}
+            base_val, base_unit = baseline[name]
+            curr_val, curr_unit = current[name]
+            base_val, base_unit = _scale_value(name, base_val, base_unit, unit_map, unit)
+            curr_val, curr_unit = _scale_value(name, curr_val, curr_unit, unit_map, unit)
+            unit = unit or base_unit or curr_unit
             if base_val is None or curr_val is None:
-                delta = None
                 status = "missing_value"
             else:
                 delta = curr_val - base_val
@@ -533,23 +645,46 @@ def summarize(metrics):
     return "PASS"
 
 
+def _row_parts(status):
+    return (
+        f'<tr class="status-{html.escape(status)}"><td>',
+        f"<td>{html.escape(status, quote=False)}</td></tr>",
+    )
+
+
+_ROW_PARTS = {
+    status: _row_parts(status)
+    for status in ("ok", "drift", "missing_baseline", "missing_current", "missing_value")
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _thresholds_block(thresholds_json):
+    # Keyed by the compact encoding, which the C encoder produces far faster
+    # than the indented dump and escape it stands in for.
+    return html.escape(json.dumps(json.loads(thresholds_json), indent=2, sort_keys=True))
+
+
 def render_report(run_id, baseline_id, summary, metrics, drift_count, config_hash, thresholds, template_name):
+    escape = html.escape
     rows = []
     for m in metrics:
-        status_class = f"status-{m['status']}"
+        status = m["status"]
+        row_parts = _ROW_PARTS.get(status)
+        if row_parts is None:
+            row_parts = _row_parts(status)
+        row_start, row_end = row_parts
         rows.append(
-            f"<tr class=\"{status_class}\">"
-            f"<td>{m['name']}</td>"
+            f"{row_start}{escape(m['name'], False)}</td>"
             f"<td>{m['baseline']}</td>"
             f"<td>{m['current']}</td>"
             f"<td>{m['delta']}</td>"
             f"<td>{m['threshold']}</td>"
-            f"<td>{m['unit'] or ''}</td>"
-            f"<td>{m['status']}</td>"
-            "</tr>"
+            f"<td>{escape(m['unit'], False) if m['unit'] else ''}</td>"
+            f"{row_end}"
         )
     table_rows = "\n".join(rows)
-    thresholds_block = html.escape(json.dumps(thresholds, indent=2, sort_keys=True))
+    thresholds_block = _thresholds_block(json.dumps(thresholds, sort_keys=True, separators=(",", ":")))
     template_line = f"Template: {template_name}" if template_name else "Template: none"
     return f"""<!doctype html>
 <html lang="en">
@@ -690,7 +825,7 @@ def main():
         }
         diff_path = os.path.join(report_dir, "run-diff.json")
         with open(diff_path, "w") as f:
-            json.dump(diff_payload, f, indent=2)
+            json.dump(diff_payload, f, separators=(",", ":"))
 
         summary_path = os.path.join(report_dir, "run-summary.txt")
         with open(summary_path, "w") as f:
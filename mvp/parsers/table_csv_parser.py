@@ -8,10 +8,9 @@ def parse(path):
         reader = csv.DictReader(f)
         if reader.fieldnames is None:
             raise analyze.ParseError("CSV missing header row")
-        rows = list(reader)
-        if not rows:
+        row = next(reader, None)
+        if row is None:
             raise analyze.ParseError("CSV contains no data rows")
-        row = rows[0]
         metrics = {}
         for key, value in row.items():
             if key is None:
@@ -110,7 +110,7 @@ def run_analyze(args):
     }
     diff_path = os.path.join(report_dir, "run-diff.json")
     with open(diff_path, "w") as f:
-        json.dump(diff_payload, f, indent=2)
+        json.dump(diff_payload, f, separators=(",", ":"))
 
     summary_path = os.path.join(report_dir, "run-summary.txt")
     with open(summary_path, "w") as f:
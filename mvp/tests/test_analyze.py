@@ -7,11 +7,15 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from analyze import (
     compute_run_id,
     compare_metrics,
+    connect_registry,
+    init_registry,
     load_metrics_csv,
     load_metrics_log,
+    load_thresholds,
     normalize_metric_value,
     render_report,
     summarize,
+    upsert_runs,
 )
 from registry_cli import write_trend
 
@@ -60,6 +64,58 @@ class AnalyzeTests(unittest.TestCase):
         self.assertEqual(unit, "ms")
         self.assertAlmostEqual(value, 1200.0)
 
+    def test_load_thresholds_reloads_on_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "thresholds.yaml")
+            with open(path, "w") as f:
+                f.write("metrics:\n  reset_count:\n    drift_threshold: 1\n")
+            first = load_thresholds(path)
+            self.assertIs(load_thresholds(path), first)
+            with open(path, "w") as f:
+                f.write("metrics:\n  reset_count:\n    drift_threshold: 2\n")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_thresholds(path)["reset_count"]["drift_threshold"], 2)
+
+    def test_upsert_runs_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = init_registry(os.path.join(tmpdir, "runs.db"))
+            payloads = [
+                {
+                    "run_id": run_id,
+                    "baseline_id": "base-001",
+                    "run_path": f"/runs/{run_id}.csv",
+                    "baseline_path": "/runs/baseline.csv",
+                    "config_path": "/config/thresholds.yaml",
+                    "config_hash": "abc123",
+                    "summary": summary,
+                    "metrics_count": 7,
+                    "drift_count": 0,
+                    "created_at": "2025-01-01T00:00:00+00:00",
+                    "report_dir": f"/reports/{run_id}",
+                    "report_path": f"/reports/{run_id}/run-report.html",
+                    "diff_path": f"/reports/{run_id}/run-diff.json",
+                    "summary_path": f"/reports/{run_id}/run-summary.txt",
+                }
+                for run_id, summary in [("run-001", "PASS"), ("run-002", "PASS"), ("run-001", "FAIL")]
+            ]
+            upsert_runs(conn, payloads)
+            rows = conn.execute("SELECT run_id, summary FROM runs ORDER BY run_id").fetchall()
+            conn.close()
+        self.assertEqual(rows, [("run-001", "FAIL"), ("run-002", "PASS")])
+
+    def test_connect_registry_journal_modes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = connect_registry(os.path.join(tmpdir, "runs.db"))
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            conn.close()
+        # Without WAL the default (FULL) synchronous level is kept.
+        conn = connect_registry(":memory:")
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "memory")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 2)
+        conn.close()
+
     def test_golden_report_snapshot(self):
         baseline = {
             "reset_count": (0, None),
@@ -32,7 +32,7 @@ def _resolve_root(raw_root):
 
 
 def _slice_series(series, start_index, end_index):
-    return series[(series["index"] >= start_index) & (series["index"] <= end_index)]
+    return series.between(start_index, end_index)
 
 
 def main():
@@ -287,3 +287,236 @@ def test_baseline_request_approve_flow(tmp_path):
     conn = registry.init_db(db_path)
     tags = registry.list_baseline_tags(conn)
     assert any(tag == "golden" and tag_run_id == run_id for tag, tag_run_id, *_ in tags)
+
+
+def test_report_escapes_metric_cells(tmp_path):
+    from hb.report import write_report
+
+    payload = {
+        "run_id": "run-1",
+        "status": "PASS_WITH_DRIFT",
+        "drift_metrics": [
+            {"metric": "<script>x</script>", "baseline": 1.0, "current": 2.0, "delta": 1.0, "unit": "a&b"}
+        ],
+    }
+    _, html_path = write_report(str(tmp_path), payload)
+    with open(html_path, "r") as f:
+        html_doc = f.read()
+    assert "<td>&lt;script&gt;x&lt;/script&gt;</td>" in html_doc
+    assert "<td>a&amp;b</td>" in html_doc
+    assert "<script>x</script>" not in html_doc
+
+
+def test_report_escapes_header_cards_and_feedback_json(tmp_path):
+    from hb.report import write_report
+
+    payload = {
+        "run_id": "<b>run-1</b>",
+        "status": "PASS_WITH_DRIFT",
+        "baseline_reason": "a&b",
+        "drift_metrics": [],
+        "drift_attribution": {
+            "top_drivers": [{"metric_name": "</script><script>alert(1)</script>", "direction": "up"}]
+        },
+    }
+    _, html_path = write_report(str(tmp_path), payload)
+    with open(html_path, "r") as f:
+        html_doc = f.read()
+    assert '<div class="big">&lt;b&gt;run-1&lt;/b&gt;</div>' in html_doc
+    assert "Baseline reason: a&amp;b" in html_doc
+    assert "<b>run-1</b>" not in html_doc
+    assert "</script><script>alert(1)" not in html_doc
+    assert '"metric": "<\\/script><script>alert(1)<\\/script>"' in html_doc
+
+
+def test_write_report_surfaces_json_errors(tmp_path, monkeypatch):
+    from hb import report
+
+    def _fail(path, payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(report, "write_json", _fail)
+    with pytest.raises(OSError, match="disk full"):
+        report.write_report(str(tmp_path), {"run_id": "run-1", "status": "PASS", "drift_metrics": []})
+
+
+def test_pdf_pure_python_fallback(tmp_path):
+    pytest.importorskip("fpdf")
+    from hb.report import write_report, _write_pdf_pure_python
+
+    payload = {
+        "run_id": "run-1",
+        "status": "PASS",
+        "drift_metrics": [{"metric": f"m{i}", "baseline": 1.0, "current": 1.0, "delta": 0.0} for i in range(100)],
+    }
+    _, html_path = write_report(str(tmp_path), payload)
+    pdf_path = os.path.join(tmp_path, "drift_report.pdf")
+    path, error = _write_pdf_pure_python(html_path, pdf_path)
+    assert error is None
+    assert path == pdf_path
+    assert os.path.getsize(pdf_path) > 0
+
+
+def test_write_pdf_reuses_identical_html(tmp_path, monkeypatch):
+    from hb import report
+
+    html_path = os.path.join(tmp_path, "drift_report.html")
+    with open(html_path, "w") as f:
+        f.write("<div>same</div>")
+    calls = []
+
+    def _fake_pdf(src, dst):
+        calls.append(dst)
+        with open(dst, "wb") as f:
+            f.write(b"%PDF-fake")
+        return dst, None
+
+    monkeypatch.setattr(report, "_PDF_CACHE", {})
+    monkeypatch.setattr(report, "_wkhtmltopdf_path", lambda: None)
+    monkeypatch.setattr(report, "_write_pdf_pure_python", _fake_pdf)
+    first = os.path.join(tmp_path, "a.pdf")
+    second = os.path.join(tmp_path, "b.pdf")
+    assert report.write_pdf(html_path, first) == (first, None)
+    assert report.write_pdf(html_path, second) == (second, None)
+    assert calls == [first]
+    with open(second, "rb") as f:
+        assert f.read() == b"%PDF-fake"
+
+
+def test_write_pdf_ignores_overwritten_cache_entry(tmp_path, monkeypatch):
+    from hb import report
+
+    calls = []
+
+    def _fake_pdf(src, dst):
+        calls.append(src)
+        with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+            f_out.write(b"%PDF-" + f_in.read())
+        return dst, None
+
+    monkeypatch.setattr(report, "_PDF_CACHE", {})
+    monkeypatch.setattr(report, "_wkhtmltopdf_path", lambda: None)
+    monkeypatch.setattr(report, "_write_pdf_pure_python", _fake_pdf)
+    html_a = os.path.join(tmp_path, "a.html")
+    html_b = os.path.join(tmp_path, "b.html")
+    with open(html_a, "w") as f:
+        f.write("<div>a</div>")
+    with open(html_b, "w") as f:
+        f.write("<div>b</div>")
+    shared = os.path.join(tmp_path, "report.pdf")
+    copy = os.path.join(tmp_path, "copy.pdf")
+    report.write_pdf(html_a, shared)
+    report.write_pdf(html_b, shared)
+    assert report.write_pdf(html_a, copy) == (copy, None)
+    assert calls == [html_a, html_b, html_a]
+    with open(copy, "rb") as f:
+        assert f.read() == b"%PDF-<div>a</div>"
+
+
+def test_vxworks_severity_and_templates():
+    from hb_core.adapters import vxworks
+
+    assert vxworks._extract_severity("INFO: retry after ERROR") == "ERROR"
+    assert vxworks._extract_severity("dbg WRN link flap") == "WARN"
+    assert vxworks._extract_severity("no level here") is None
+    assert vxworks._templateize("tTask1  read 0x1f at 12   ok") == "<id> read <hex> at <int> ok"
+
+
+def test_smap_msl_parse_many_matches_parse(tmp_path):
+    import numpy as np
+
+    from ingest.parsers import smap_msl_telemetry
+
+    test_dir = tmp_path / "data" / "test"
+    test_dir.mkdir(parents=True)
+    for offset, chan_id in enumerate(["A-1", "A-2", "B-1"]):
+        np.save(test_dir / f"{chan_id}.npy", np.arange(50, dtype=float) + offset)
+
+    chan_ids = ["A-1", "A-2", "B-1"]
+    results = smap_msl_telemetry.parse_many(str(tmp_path), "SMAP", chan_ids, start_index=10, end_index=19)
+    assert list(results) == chan_ids
+    for chan_id in chan_ids:
+        assert results[chan_id] == smap_msl_telemetry.parse(str(tmp_path), "SMAP", chan_id, 10, 19)
+    assert results["A-2"]["smap_msl_mean"]["value"] == 15.5
+
+
+def test_build_schema_multiline_cell_at_sample_boundary(tmp_path):
+    import yaml
+
+    from hb_core.compare.run_compare import _SCHEMA_SAMPLE_ROWS, _build_schema_from_file
+
+    rows = ["id,note,value"] + [f"{i},plain,{i}.5" for i in range(_SCHEMA_SAMPLE_ROWS - 1)]
+    rows.append(f'{_SCHEMA_SAMPLE_ROWS - 1},"line one\nline two",1.5')
+    rows += [f"{i},plain,{i}.5" for i in range(_SCHEMA_SAMPLE_ROWS, 600)]
+    sample_path = tmp_path / "baseline.csv"
+    sample_path.write_text("\n".join(rows) + "\n")
+
+    schema_path = _build_schema_from_file("sample", str(sample_path), str(tmp_path))
+    with open(schema_path, "r") as f:
+        schema = yaml.safe_load(f)
+    assert schema["optional_columns"] == ["id", "note", "value"]
+    assert schema["column_types"] == {"id": "int", "note": "str", "value": "float"}
+
+
+def test_aggregate_jsonl_non_ascii_key(tmp_path):
+    from hb_core import ingest_stream
+
+    path = tmp_path / "metrics.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"métrique": "m", "value": 1.0}, ensure_ascii=False) + "\n")
+        f.write(json.dumps({"métrique": "m", "value": 3.0}) + "\n")
+    result = ingest_stream.aggregate_jsonl(str(path), metric_key="métrique")
+    assert result["m"]["count"] == 2
+    assert result["m"]["mean"] == 2.0
+
+
+def test_stream_aggregates_match_row_by_row(tmp_path, monkeypatch):
+    import math
+
+    from hb_core import ingest_stream
+
+    rows = [
+        ("a", "1.5"), ("b", "2"), ("a", "x"), ("a", "4.25"),
+        ("b", "-3"), ("a", ""), ("a", "10"), ("c", "7.5"),
+        ("b", "n/a"), ("a", "-2"), ("b", "8"), ("a", "0.5"),
+    ]
+    expected = {}
+    for metric, value in rows:
+        try:
+            value = float(value)
+        except ValueError:
+            continue
+        expected.setdefault(metric, ingest_stream.Welford()).update(value)
+    expected = {metric: agg.summary() for metric, agg in expected.items()}
+
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text("metric,value\n" + "".join(f"{m},{v}\n" for m, v in rows))
+    jsonl_path = tmp_path / "metrics.jsonl"
+    jsonl_path.write_text("".join(json.dumps({"metric": m, "value": v}) + "\n" for m, v in rows))
+
+    # Metric "c" only appears in the third CSV chunk.
+    monkeypatch.setattr(ingest_stream, "_CHUNK_ROWS", 3)
+    for result in (ingest_stream.aggregate_csv(str(csv_path)), ingest_stream.aggregate_jsonl(str(jsonl_path))):
+        assert result.keys() == expected.keys()
+        for metric, summary in expected.items():
+            assert result[metric]["count"] == summary["count"]
+            assert result[metric]["min"] == summary["min"]
+            assert result[metric]["max"] == summary["max"]
+            for key in ("mean", "std"):
+                assert math.isclose(result[metric][key], summary[key], rel_tol=1e-12, abs_tol=1e-12)
+
+
+def test_smap_msl_samples_are_pinned():
+    import numpy as np
+
+    from ingest.parsers.smap_msl_telemetry import TelemetrySeries, metrics_from_series
+
+    values = np.arange(5000, dtype=float)
+    series = TelemetrySeries(np.arange(5000), values, True)
+    samples = metrics_from_series(series, sample_size=10)["smap_msl_value_dist"]["tags"]["samples"]
+    # np.random.default_rng(0).choice(5000, size=10, replace=False)
+    assert samples == [4245.0, 4066.0, 3179.0, 2552.0, 1347.0, 204.0, 82.0, 1537.0, 876.0, 375.0]
+    assert metrics_from_series(series, sample_size=10)["smap_msl_value_dist"]["tags"]["samples"] == samples
+
+    large = metrics_from_series(series, sample_size=4000)["smap_msl_value_dist"]["tags"]["samples"]
+    assert len(large) == len(set(large)) == 4000